@@ -1,44 +1,151 @@
+import hashlib
 import os
-import subprocess
+import shutil
 import sys
 
 import click
-from spin import util
-from spin.cmds import meson
+
+
+def get_executable(name) -> str:
+    return shutil.which(name) or name
 
 
 def get_git_revision_hash(submodule) -> str:
-    return subprocess.check_output(["git", "rev-parse", f"@:{submodule}"]).decode("ascii").strip()
+    import subprocess
+
+    # CPython only spawns through posix_spawn instead of fork + exec when the
+    # executable is given with a directory part and close_fds=False
+    return (
+        subprocess.check_output(
+            [get_executable("git"), "rev-parse", f"@:{submodule}"], close_fds=False
+        )
+        .decode("ascii")
+        .strip()
+    )
+
+
+def get_git_version() -> tuple:
+    import re
+    import subprocess
+
+    output = subprocess.check_output([get_executable("git"), "--version"], close_fds=False)
+    match = re.search(r"(\d+)\.(\d+)", output.decode("ascii", errors="replace"))
+    return tuple(int(part) for part in match.groups()) if match else (0, 0)
+
+
+def is_nonempty_dir(path) -> bool:
+    if not os.path.isdir(path):
+        return False
+    # stop at the first entry instead of listing the whole directory
+    with os.scandir(path) as entries:
+        return next(entries, None) is not None
+
+
+def set_pythonpath(site_path):
+    # only join an existing PYTHONPATH, since a trailing empty entry puts the current
+    # directory on sys.path and is stat'ed on every import
+    pythonpath = os.environ.get("PYTHONPATH", "")
+    os.environ["PYTHONPATH"] = site_path + (os.pathsep + pythonpath if pythonpath else "")
+
+
+def get_doc_requirements() -> list:
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    with open("pyproject.toml", "rb") as f:
+        return tomllib.load(f)["project"]["optional-dependencies"]["doc"]
+
+
+def get_newest_mtime(*paths, exclude=()) -> float:
+    newest = 0.0
+    for path in paths:
+        if os.path.isfile(path):
+            newest = max(newest, os.stat(path).st_mtime)
+        for root, dirnames, filenames in os.walk(path):
+            dirnames[:] = [
+                dirname
+                for dirname in dirnames
+                if dirname != "__pycache__" and os.path.join(root, dirname) not in exclude
+            ]
+            for filename in filenames:
+                newest = max(newest, os.stat(os.path.join(root, filename)).st_mtime)
+    return newest
+
+
+def get_site_packages():
+    """Return the site-packages of the scikit-tree install, cached in ``build/.site-path``.
+
+    The cache is invalidated whenever meson rewrites its install plan.
+    """
+    from spin.cmds import meson
+
+    cache_fpath = "./build/.site-path"
+    install_plan_fpath = "./build/meson-info/intro-install_plan.json"
+    if (
+        os.path.exists(cache_fpath)
+        and os.path.exists(install_plan_fpath)
+        and os.stat(cache_fpath).st_mtime >= os.stat(install_plan_fpath).st_mtime
+    ):
+        with open(cache_fpath, "r") as f:
+            site_path = f.read().strip()
+        if os.path.isdir(site_path):
+            return site_path
+
+    site_path = meson._get_site_packages()
+    if site_path is not None and os.path.isdir("./build"):
+        with open(cache_fpath, "w") as f:
+            f.write(site_path)
+    return site_path
 
 
 @click.command()
 @click.argument("slowtest", default=True)
+@click.option("--no-cov", is_flag=True, help="Run the test suite without coverage instrumentation.")
+@click.option("--fast", is_flag=True, help="Same as --no-cov, and also skip the pytest cache.")
 @click.pass_context
-def coverage(ctx, slowtest=True):
-    """📊 Generate coverage report"""
+def coverage(ctx, slowtest=True, no_cov=False, fast=False):
+    """📊 Generate coverage report
+
+    Tests are distributed over all available cores with ``pytest-xdist``,
+    keeping each test module on a single worker (``--dist=loadfile``) so that
+    module-level fixtures and data are only built once. ``pytest-cov``
+    combines the per-worker coverage data. The 25 slowest tests taking more
+    than 0.1s are reported at the end to surface runtime regressions.
+
+    Coverage instrumentation slows the suite down considerably, so use
+    ``--no-cov`` or ``--fast`` when iterating locally; CI runs the full
+    coverage job.
+    """
+    from spin.cmds import meson
+
+    pytest_args = (
+        "-o",
+        "python_functions=test_*",
+        "-n",
+        "auto",
+        "--dist=loadfile",
+        "sktree",
+        "--cov=sktree",
+        "--cov-report=xml",
+        "--cov-config=pyproject.toml",
+        "--durations=25",
+        "--durations-min=0.1",
+    )
     if slowtest:
-        pytest_args = (
-            "-o",
-            "python_functions=test_*",
-            "sktree",
-            "--cov=sktree",
-            "--cov-report=xml",
-            "--cov-config=pyproject.toml",
-            "-k .",
-        )
-    else:
-        pytest_args = (
-            "-o",
-            "python_functions=test_*",
-            "sktree",
-            "--cov=sktree",
-            "--cov-report=xml",
-            "--cov-config=pyproject.toml",
-        )
+        pytest_args += ("-k .",)
+
+    if no_cov or fast:
+        pytest_args = tuple(arg for arg in pytest_args if not arg.startswith("--cov"))
+    if fast:
+        pytest_args += ("-p", "no:cacheprovider")
 
     # The spin `build` command doesn't know anything about `custom_arg`,
     # so don't send it on.
     del ctx.params["slowtest"]
+    del ctx.params["no_cov"]
+    del ctx.params["fast"]
 
     ctx.invoke(meson.test, pytest_args=pytest_args)
 
@@ -61,75 +168,58 @@ def setup_submodule(forcesubmodule=False):
     This will update the submodule, which then must be commited so that
     git knows the submodule needs to be at a certain commit hash.
     """
+    from spin import util
+
     commit_fpath = "./sktree/_lib/commit.txt"
     submodule = "./sktree/_lib/sklearn_fork"
     commit = ""
     current_hash = ""
 
-    # if the forked folder does not exist, we will need to force update the submodule
-    if not os.path.exists("./sktree/_lib/sklearn/") or forcesubmodule:
-        # update git submodule
-        util.run(["git", "submodule", "update", "--init", "--force"])
-    else:
-        # update git submodule
-        util.run(
-            [
-                "git",
-                "submodule",
-                "update",
-                "--init",
-                "--force",
-            ]
-        )
-
     # get the commit hash if the commmit file exists
     if os.path.exists(commit_fpath):
         with open(commit_fpath, "r") as f:
             commit = f.read().strip()
 
-    # get revision hash
+    # get revision hash pinned by the superproject; this is read from the local
+    # git object store and does not require the submodule to be checked out
     current_hash = get_git_revision_hash(submodule)
 
+    # if the forked folder does not exist or is empty, we will need to force update the submodule,
+    # otherwise only update it when the pinned commit has moved
+    if not is_nonempty_dir("./sktree/_lib/sklearn/") or forcesubmodule or current_hash != commit:
+        # the first clone of the fork is a blobless partial clone, so only the blobs
+        # of the pinned commit are downloaded
+        git = get_executable("git")
+        update_cmd = [git, "submodule", "update", "--init", "--force"]
+        # `git submodule update --filter` is only available since git 2.36
+        if get_git_version() >= (2, 36):
+            update_cmd += ["--filter=blob:none"]
+        util.run(update_cmd + ["--", submodule], close_fds=False)
+
     print(current_hash)
     print(commit)
 
     # if the commit file doesn't exist or the commit hash is different, we need
     # to update our sklearn repository
     if current_hash == "" or current_hash != commit:
-        util.run(
-            [
-                "mkdir",
-                "-p",
-                "./sktree/_lib/sklearn/",
-            ],
-        )
-        util.run(
-            [
-                "touch",
-                commit_fpath,
-            ],
-        )
-        print(commit_fpath)
-        with open(commit_fpath, "w") as f:
-            f.write(current_hash)
-
-        util.run(
-            [
-                "rm",
-                "-rf",
-                "sktree/_lib/sklearn",
-            ]
-        )
-
         if os.path.exists("sktree/_lib/sklearn_fork/sklearn") and (commit != current_hash):
-            util.run(
-                [
-                    "cp",
-                    "-r",
-                    "sktree/_lib/sklearn_fork/sklearn",
-                    "sktree/_lib/sklearn",
-                ]
-            )
+            # stage the new copy next to the old one and swap it in with renames, so
+            # the old tree is only removed once the new one is complete
+            shutil.rmtree("sktree/_lib/sklearn_next", ignore_errors=True)
+            shutil.copytree("sktree/_lib/sklearn_fork/sklearn", "sktree/_lib/sklearn_next")
+            if os.path.exists("sktree/_lib/sklearn"):
+                shutil.rmtree("sktree/_lib/sklearn_old", ignore_errors=True)
+                os.rename("sktree/_lib/sklearn", "sktree/_lib/sklearn_old")
+            os.rename("sktree/_lib/sklearn_next", "sktree/_lib/sklearn")
+
+            # only record the new hash once the refreshed tree is in place, so an
+            # interrupted copy is retried by the next build
+            print(commit_fpath)
+            with open(commit_fpath, "w") as f:
+                f.write(current_hash)
+            shutil.rmtree("sktree/_lib/sklearn_old", ignore_errors=True)
+        else:
+            shutil.rmtree("sktree/_lib/sklearn", ignore_errors=True)
 
 
 @click.command()
@@ -168,8 +258,24 @@ def build(
     This will update the submodule, which then must be commited so that
     git knows the submodule needs to be at a certain commit hash.
     """
+    from spin.cmds import meson
+
+    # always pass an explicit job count to ninja, based on the CPUs this process may
+    # actually run on, since ninja's own guess can be off inside containers
+    if jobs is None:
+        if hasattr(os, "sched_getaffinity"):
+            jobs = len(os.sched_getaffinity(0))
+        else:
+            jobs = os.cpu_count() or 1
+        ctx.params["jobs"] = jobs
+
     ctx.invoke(setup_submodule, forcesubmodule=forcesubmodule)
 
+    # meson already wraps the compilers with ccache when it is on the PATH; setting the
+    # base directory makes cache entries reusable across checkouts in different paths
+    if shutil.which("ccache") is not None:
+        os.environ.setdefault("CCACHE_BASEDIR", os.getcwd())
+
     # The spin `build` command doesn't know anything about `custom_arg`,
     # so don't send it on.
     del ctx.params["forcesubmodule"]
@@ -180,6 +286,105 @@ def build(
     ctx.forward(meson.build)
 
 
+@click.command()
+@click.option("--clean", is_flag=True, help="Clean previously built docs before building.")
+@click.option("--noplot", is_flag=True, help="Build the docs without running the examples.")
+@click.option("-j", "--jobs", default="auto", help="Number of parallel Sphinx jobs.")
+@click.option(
+    "--build/--no-build", "first_build", default=True, help="Build scikit-tree before the docs."
+)
+@click.option(
+    "--install-deps", is_flag=True, help="Install the `doc` requirements if they changed."
+)
+@click.pass_context
+def docs(ctx, clean=False, noplot=False, jobs="auto", first_build=True, install_deps=False):
+    """📖 Build documentation
+
+    Calls ``sphinx-build`` directly rather than going through ``make clean html``,
+    so the Sphinx environment pickle and doctrees are reused between runs and
+    reading/writing is parallelized across ``--jobs`` processes. Only pass
+    ``--clean`` when a full rebuild is needed.
+
+    With ``--install-deps``, the ``doc`` extra from ``pyproject.toml`` is only
+    pip-installed when its hash differs from the one recorded in
+    ``build/.doc_reqs_hash`` by the last install. ``uv pip`` is used instead
+    of ``pip`` when ``uv`` is available.
+
+    A successful build writes ``build/.docs-ok``; if no file under ``doc/``,
+    ``examples/`` or ``sktree/``, nor ``pyproject.toml`` or ``meson.build``,
+    changed since then and no doc requirements were installed, the build is
+    skipped.
+    """
+    from spin import util
+
+    marker_fpath = "./build/.docs-ok"
+    if install_deps:
+        requirements = get_doc_requirements()
+        reqs_hash = hashlib.sha256("\n".join(requirements).encode("utf-8")).hexdigest()
+        hash_fpath = "./build/.doc_reqs_hash"
+        installed_hash = ""
+        if os.path.exists(hash_fpath):
+            with open(hash_fpath, "r") as f:
+                installed_hash = f.read().strip()
+
+        if installed_hash != reqs_hash:
+            # uv resolves and downloads in parallel, which is much faster than pip
+            uv = shutil.which("uv")
+            if uv:
+                pip_cmd = [uv, "pip", "install", "--python", sys.executable]
+            else:
+                pip_cmd = [sys.executable, "-m", "pip", "install"]
+            util.run(pip_cmd + ["-q"] + requirements, close_fds=False)
+            # the newly installed doc dependencies can change the rendered docs
+            if os.path.exists(marker_fpath):
+                os.remove(marker_fpath)
+            os.makedirs(os.path.dirname(hash_fpath), exist_ok=True)
+            with open(hash_fpath, "w") as f:
+                f.write(reqs_hash)
+
+    generated_dirs = ("doc/_build", "doc/auto_examples", "doc/generated")
+    target = "html-noplot" if noplot else "html"
+    if clean:
+        for path in generated_dirs:
+            shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(marker_fpath):
+        with open(marker_fpath, "r") as f:
+            built_target = f.read().strip()
+        newest_source = get_newest_mtime(
+            "doc",
+            "examples",
+            "sktree",
+            "pyproject.toml",
+            "meson.build",
+            exclude=generated_dirs + ("sktree/_lib/sklearn", "sktree/_lib/sklearn_fork"),
+        )
+        if built_target == target and newest_source < os.stat(marker_fpath).st_mtime:
+            print("Documentation is up to date; pass --clean to force a rebuild.")
+            return
+
+    if first_build:
+        ctx.invoke(build)
+
+    site_path = get_site_packages()
+    if site_path is None:
+        print("No built scikit-tree found; run `spin build` first.")
+        sys.exit(1)
+    set_pythonpath(site_path)
+
+    # same options as the `html` and `html-noplot` targets of doc/Makefile, so both
+    # share the doctree cache in doc/_build/doctrees
+    cmd = [get_executable("sphinx-build"), "-b", "html", "-d", "doc/_build/doctrees"]
+    cmd += ["-j", str(jobs), "-nWT", "--keep-going"]
+    if noplot:
+        cmd += ["-D", "plot_gallery=0"]
+    cmd += ["doc", "doc/_build/html"]
+    util.run(cmd, close_fds=False)
+
+    os.makedirs(os.path.dirname(marker_fpath), exist_ok=True)
+    with open(marker_fpath, "w") as f:
+        f.write(target)
+
+
 @click.command()
 @click.argument("asv_args", nargs=-1)
 def asv(asv_args):
@@ -193,11 +398,13 @@ def asv(asv_args):
 
     Please see CONTRIBUTING.txt
     """
-    site_path = meson._get_site_packages()
+    from spin import util
+
+    site_path = get_site_packages()
     if site_path is None:
         print("No built scikit-tree found; run `spin build` first.")
         sys.exit(1)
 
     os.environ["ASV_ENV_DIR"] = "/Users/adam2392/miniforge3"
-    os.environ["PYTHONPATH"] = f'{site_path}{os.sep}:{os.environ.get("PYTHONPATH", "")}'
-    util.run(["asv"] + list(asv_args))
+    set_pythonpath(site_path)
+    util.run([get_executable("asv")] + list(asv_args), close_fds=False)
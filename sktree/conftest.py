@@ -1,4 +1,8 @@
+import os
+
+import joblib
 import pytest
+from threadpoolctl import threadpool_limits
 
 # With the following global module marker,
 # monitoring is disabled by default:
@@ -8,3 +12,12 @@ pytestmark = [pytest.mark.monitor_skip_test]
 def pytest_configure(config):
     """Set up pytest markers."""
     config.addinivalue_line("markers", "slowtest: mark test as slow")
+
+    xdist_worker_count = os.environ.get("PYTEST_XDIST_WORKER_COUNT")
+    if xdist_worker_count is not None:
+        # Split the cores between the xdist workers to prevent oversubscription:
+        # cap the openmp and blas threads, and what ``n_jobs=-1`` resolves to.
+        allowed_parallelism = joblib.cpu_count(only_physical_cores=True)
+        allowed_parallelism = max(allowed_parallelism // int(xdist_worker_count), 1)
+        os.environ.setdefault("LOKY_MAX_CPU_COUNT", str(allowed_parallelism))
+        threadpool_limits(allowed_parallelism)
@@ -85,6 +85,37 @@ class ForestCluster(SimMatrixMixin, TransformerMixin, ClusterMixin, BaseForest):
         self : object
             Returns the instance itself.
         """
+        self._fit_transform(X, sample_weight=sample_weight)
+        return self
+
+    def fit_transform(self, X, y=None, sample_weight=None):
+        """Fit estimator and transform X to its similarity matrix.
+
+        Equivalent to ``fit(X).transform(X)``, but reuses the similarity matrix
+        computed during fit to assign ``labels_``, so the samples are only passed
+        down the trees once.
+
+        Parameters
+        ----------
+        X : {array-like, sparse matrix} of shape (n_samples, n_features)
+            The input samples. Use ``dtype=np.float32`` for maximum
+            efficiency.
+
+        y : Ignored
+            Not used, present for API consistency by convention.
+
+        sample_weight : array-like of shape (n_samples,), default=None
+            Sample weights. If None, then samples are equally weighted.
+
+        Returns
+        -------
+        X_new : ndarray of shape (n_samples, n_samples)
+            The similarity matrix of X.
+        """
+        return self._fit_transform(X, sample_weight=sample_weight)
+
+    def _fit_transform(self, X, sample_weight=None):
+        """Fit the forest, assign ``labels_`` and return the similarity matrix of X."""
         self._validate_params()
 
         # Validate or convert input data
@@ -188,7 +219,7 @@ class ForestCluster(SimMatrixMixin, TransformerMixin, ClusterMixin, BaseForest):
         # compute the labels and set it
         self.labels_ = self._assign_labels(sim_mat)
 
-        return self
+        return sim_mat
 
     def predict(self, X):
         """Predict clusters for X.
@@ -5,6 +5,7 @@ from typing import Callable
 import numpy as np
 from joblib import Parallel, delayed
 from numpy.typing import ArrayLike
+from scipy.stats import beta
 from sklearn.base import clone
 from sklearn.ensemble._base import _partition_estimators
 from sklearn.model_selection import StratifiedKFold, train_test_split
@@ -44,6 +45,33 @@ def _parallel_predict_proba_oob(predict_proba, X, out, idx, test_idx, lock):
     return prediction
 
 
+def _pvalue_is_decided(n_extreme, n_repeats, alpha, confidence=0.99):
+    """Whether the Clopper-Pearson interval of a Monte Carlo p-value excludes alpha.
+
+    Parameters
+    ----------
+    n_extreme : int
+        Number of null test statistics at least as extreme as the observed one.
+    n_repeats : int
+        Number of null test statistics computed so far.
+    alpha : float
+        The significance level.
+    confidence : float, optional
+        The confidence level of the interval, by default 0.99.
+
+    Returns
+    -------
+    bool
+        Whether further permutations can no longer move the p-value across ``alpha``.
+    """
+    tail = (1 - confidence) / 2
+    lower = beta.ppf(tail, n_extreme, n_repeats - n_extreme + 1) if n_extreme > 0 else 0.0
+    upper = (
+        beta.ppf(1 - tail, n_extreme + 1, n_repeats - n_extreme) if n_extreme < n_repeats else 1.0
+    )
+    return bool(upper < alpha or lower > alpha)
+
+
 ForestTestResult = namedtuple(
     "ForestTestResult",
     ["observe_test_stat", "permuted_stat", "observe_stat", "pvalue", "null_dist"],
@@ -189,6 +217,8 @@ def build_permutation_forest(
     verbose=False,
     seed=None,
     return_posteriors=True,
+    early_stop=False,
+    alpha=0.05,
     **metric_kwargs,
 ):
     """Build a hypothesis testing forest using a permutation-forest approach.
@@ -226,6 +256,14 @@ def build_permutation_forest(
         Random seed, by default None.
     return_posteriors : bool, optional
         Whether or not to return the posteriors, by default True.
+    early_stop : bool, optional
+        Whether to stop training null forests once the p-value is decided, by
+        default False. Every 25 permutations, starting from 50, the 99%
+        Clopper-Pearson interval of the p-value is computed and the loop stops
+        early if it lies entirely on one side of ``alpha``. ``n_repeats`` is then
+        the maximum number of permutations.
+    alpha : float, optional
+        The significance level used by ``early_stop``, by default 0.05.
     **metric_kwargs : dict, optional
         Additional keyword arguments to pass to the metric function.
 
@@ -269,6 +307,7 @@ def build_permutation_forest(
     # train many null forests
     X_perm = X.copy()
     null_dist = []
+    n_extreme = 0
     for _ in range(n_repeats):
         rng.shuffle(index_arr)
         perm_X_cov = X_perm[index_arr, covariate_index]
@@ -286,12 +325,25 @@ def build_permutation_forest(
         permute_stat = metric_func(y, y_pred_proba_perm, **metric_kwargs)
         null_dist.append(permute_stat)
 
-    # compute pvalue, which note is opposite that of the Coleman approach, since
-    # we are testing if the null distribution results in a test statistic greater
-    if metric in POSITIVE_METRICS:
-        pvalue = (1 + (null_dist >= observe_test_stat).sum()) / (1 + n_repeats)
-    else:
-        pvalue = (1 + (null_dist <= observe_test_stat).sum()) / (1 + n_repeats)
+        # count the null test statistics at least as extreme as the observed one,
+        # which note is opposite that of the Coleman approach, since
+        # we are testing if the null distribution results in a test statistic greater
+        if metric in POSITIVE_METRICS:
+            n_extreme += permute_stat >= observe_test_stat
+        else:
+            n_extreme += permute_stat <= observe_test_stat
+
+        n_done = len(null_dist)
+        if (
+            early_stop
+            and n_done >= 50
+            and n_done % 25 == 0
+            and _pvalue_is_decided(n_extreme, n_done, alpha)
+        ):
+            break
+
+    null_dist = np.asarray(null_dist)
+    pvalue = (1 + n_extreme) / (1 + len(null_dist))
 
     forest_result = ForestTestResult(observe_test_stat, permute_stat, None, pvalue, null_dist)
     if return_posteriors:
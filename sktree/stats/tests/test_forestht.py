@@ -2,7 +2,6 @@ import numpy as np
 import pytest
 from flaky import flaky
 from numpy.testing import assert_almost_equal, assert_array_equal
-from sklearn import datasets
 
 from sktree import HonestForestClassifier, RandomForestClassifier
 from sktree.stats import (
@@ -12,22 +11,12 @@ from sktree.stats import (
     build_oob_forest,
     build_permutation_forest,
 )
+from sktree.stats.forestht import _pvalue_is_decided
 from sktree.tree import MultiViewDecisionTreeClassifier
 
-# load the iris dataset (n_samples, 4)
-# and randomly permute it
-iris = datasets.load_iris()
 seed = 12345
 rng = np.random.default_rng(seed)
 
-# remove third class
-iris_X = iris.data[iris.target != 2]
-iris_y = iris.target[iris.target != 2]
-
-p = rng.permutation(iris_X.shape[0])
-iris_X = iris_X[p]
-iris_y = iris_y[p]
-
 
 @pytest.mark.parametrize("seed", [10, 0])
 def test_small_dataset_independent(seed):
@@ -387,6 +376,8 @@ def test_build_permutation_forest():
     assert forest_result.observe_test_stat > 0.1, f"{forest_result.observe_stat}"
     assert forest_result.pvalue <= 0.05, f"{forest_result.pvalue}"
     assert_array_equal(orig_forest_proba.shape, perm_forest_proba.shape)
+    # without early stopping, all the permutations are run
+    assert len(forest_result.null_dist) == 20
 
     X = np.vstack([_X, _X])
     forest_result, _, _ = build_permutation_forest(
@@ -396,6 +387,60 @@ def test_build_permutation_forest():
     assert forest_result.observe_test_stat < 0.05, f"{forest_result.observe_test_stat}"
 
 
+@pytest.mark.parametrize(
+    "n_extreme, n_repeats, decided",
+    [
+        # no null statistic as extreme: significant once enough are run
+        (0, 50, False),
+        (0, 200, True),
+        # half the null statistics as extreme: clearly not significant
+        (50, 100, True),
+        # p-value close to alpha
+        (5, 100, False),
+    ],
+)
+def test_pvalue_is_decided(n_extreme, n_repeats, decided):
+    assert _pvalue_is_decided(n_extreme, n_repeats, alpha=0.05) is decided
+
+
+@pytest.mark.slowtest
+def test_build_permutation_forest_early_stop():
+    """Test that the permutation forest stops once the p-value is decided."""
+    n_estimators = 30
+    n_samples = 100
+    n_features = 3
+    n_repeats = 300
+    rng = np.random.default_rng(seed)
+
+    _X = rng.uniform(size=(n_samples // 2, n_features))
+    X = np.vstack([_X, _X + 10])
+    y = np.vstack(
+        [np.zeros((n_samples // 2, 1)), np.ones((n_samples // 2, 1))]
+    )  # Binary classification
+
+    clf = HonestForestClassifier(
+        n_estimators=n_estimators, random_state=seed, n_jobs=-1, honest_fraction=0.5, bootstrap=True
+    )
+    perm_clf = PermutationHonestForestClassifier(
+        n_estimators=n_estimators, random_state=seed, n_jobs=-1, honest_fraction=0.5, bootstrap=True
+    )
+    forest_result = build_permutation_forest(
+        clf,
+        perm_clf,
+        X,
+        y,
+        metric="s@98",
+        n_repeats=n_repeats,
+        seed=seed,
+        return_posteriors=False,
+        early_stop=True,
+    )
+    n_done = len(forest_result.null_dist)
+    assert n_done < n_repeats
+    assert n_done % 25 == 0
+    assert forest_result.pvalue == 1 / (1 + n_done), f"{forest_result.pvalue}"
+
+
 def test_build_oob_honest_forest():
     bootstrap = True
     max_samples = 1.6
@@ -1,9 +1,10 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_allclose, assert_array_equal
+from scipy.stats import entropy
 
 from sktree import HonestForestClassifier
-from sktree.stats.utils import get_per_tree_oob_samples
+from sktree.stats.utils import _mutual_information, get_per_tree_oob_samples
 
 seed = 1234
 rng = np.random.default_rng(seed)
@@ -32,3 +33,23 @@ def test_get_per_tree_oob_samples(bootstrap):
     else:
         with pytest.raises(RuntimeError, match="Cannot extract out-of-bag samples"):
             get_per_tree_oob_samples(est)
+
+
+@pytest.mark.parametrize(
+    "y_true",
+    [
+        np.array([0, 1, 1, 2, 2, 2] * 5),
+        np.array([0.0, 1.0, 1.0, 2.0, 2.0, 2.0] * 5),
+        np.array([True, False, False] * 10),
+        np.array([-1, 1, 1, 5, 5, 5] * 5),
+        np.array([0.5, 1.5, 1.5, 2.5, 2.5, 2.5] * 5),
+        np.array([10**6, 1, 1, 2, 2, 2] * 5),
+        np.array(["a", "b", "b", "c", "c", "c"] * 5),
+    ],
+)
+def test_mutual_information(y_true):
+    y_pred_proba = rng.dirichlet(np.ones(3), size=y_true.shape[0])
+
+    _, counts = np.unique(y_true, return_counts=True)
+    expected = entropy(counts) - np.mean(entropy(y_pred_proba, axis=1))
+    assert_allclose(_mutual_information(y_true, y_pred_proba), expected)
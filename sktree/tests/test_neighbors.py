@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+from scipy.sparse import issparse
 from sklearn.datasets import make_blobs, make_classification
 from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
 from sklearn.neighbors import NearestNeighbors
@@ -18,6 +19,7 @@ from sktree.ensemble import (
     UnsupervisedRandomForest,
 )
 from sktree.neighbors import NearestNeighborsMetaEstimator
+from sktree.tree import compute_forest_similarity_matrix
 
 FORESTS = [
     ObliqueRandomForestClassifier,
@@ -46,6 +48,27 @@ def test_similarity_matrix(forest):
     assert np.all((sim_mat.diagonal() == 1))
 
 
+@pytest.mark.parametrize("max_depth", [None, 2])
+def test_similarity_matrix_counts_shared_leaves(max_depth):
+    """Deep and shallow trees take different code paths, which must agree."""
+    rng = np.random.default_rng(12345)
+    X = rng.standard_normal(size=(300, 5))
+    y = rng.integers(0, 2, size=300)
+    forest = RandomForestClassifier(n_estimators=20, max_depth=max_depth, random_state=12345)
+    forest.fit(X, y)
+
+    X_leaves = forest.apply(X)
+    expected = np.mean(
+        [np.equal.outer(X_leaves[:, i], X_leaves[:, i]) for i in range(forest.n_estimators)],
+        axis=0,
+    )
+    assert np.array_equal(compute_forest_similarity_matrix(forest, X), expected)
+
+    sim_mat = compute_forest_similarity_matrix(forest, X, sparse_output=True)
+    assert issparse(sim_mat)
+    assert np.array_equal(sim_mat.toarray(), expected)
+
+
 @pytest.fixture
 def sample_data():
     # Generate sample data for testing
@@ -15,12 +15,14 @@ FOREST_CLUSTERS = {
     "UnsupervisedObliqueRandomForest": UnsupervisedObliqueRandomForest,
 }
 
-# load iris dataset
-iris = datasets.load_iris()
-rng = np.random.RandomState(1)
-perm = rng.permutation(iris.target.size)
-iris.data = iris.data[perm]
-iris.target = iris.target[perm]
+
+@pytest.fixture(scope="session")
+def iris():
+    """Load the iris dataset with its samples randomly permuted."""
+    iris_X, iris_y = datasets.load_iris(return_X_y=True)
+    rng = np.random.RandomState(1)
+    perm = rng.permutation(iris_y.size)
+    return iris_X[perm], iris_y[perm]
 
 
 @parametrize_with_checks(
@@ -84,12 +86,13 @@ def test_check_simulation(name, forest, criterion):
 
 @pytest.mark.parametrize("name, forest", FOREST_CLUSTERS.items())
 @pytest.mark.parametrize("criterion", CLUSTER_CRITERIONS)
-def test_check_iris(name, forest, criterion):
+def test_check_iris(name, forest, criterion, iris):
     # Check consistency on dataset iris.
     n_classes = 3
+    iris_X, iris_y = iris
     est = forest(criterion=criterion, random_state=12345)
-    est.fit(iris.data, iris.target)
-    sim_mat = est.compute_similarity_matrix(iris.data)
+    est.fit(iris_X, iris_y)
+    sim_mat = est.compute_similarity_matrix(iris_X)
 
     if criterion == "twomeans":
         if "oblique" in name.lower():
@@ -104,7 +107,7 @@ def test_check_iris(name, forest, criterion):
 
     cluster = AgglomerativeClustering(n_clusters=n_classes).fit(sim_mat)
     predict_labels = cluster.fit_predict(sim_mat)
-    score = adjusted_rand_score(iris.target, predict_labels)
+    score = adjusted_rand_score(iris_y, predict_labels)
 
     # Two-means and fastBIC criterions perform similarly here
     assert (
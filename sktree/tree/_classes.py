@@ -213,6 +213,39 @@ class UnsupervisedDecisionTree(SimMatrixMixin, TransformerMixin, ClusterMixin, B
         self.clustering_func_args = clustering_func_args
 
     def fit(self, X, y=None, sample_weight=None, check_input=True):
+        self._fit_transform(X, sample_weight=sample_weight, check_input=check_input)
+        return self
+
+    def fit_transform(self, X, y=None, sample_weight=None, check_input=True):
+        """Fit the tree and transform X to its affinity matrix.
+
+        Equivalent to ``fit(X).transform(X)``, but reuses the affinity matrix
+        computed during fit to assign ``labels_``, so the samples are only passed
+        down the tree once.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            The training input samples.
+
+        y : Ignored
+            Not used, present for API consistency by convention.
+
+        sample_weight : array-like of shape (n_samples,), default=None
+            Sample weights.
+
+        check_input : bool, optional
+            Whether to validate input, by default True.
+
+        Returns
+        -------
+        X_new : ndarray of shape (n_samples, n_samples)
+            The affinity matrix of X.
+        """
+        return self._fit_transform(X, sample_weight=sample_weight, check_input=check_input)
+
+    def _fit_transform(self, X, sample_weight=None, check_input=True):
+        """Fit the tree, assign ``labels_`` and return the affinity matrix of X."""
         if check_input:
             # TODO: allow X to be sparse
             check_X_params = dict(dtype=DTYPE)  # , accept_sparse="csc"
@@ -234,7 +267,7 @@ class UnsupervisedDecisionTree(SimMatrixMixin, TransformerMixin, ClusterMixin, B
         if n_samples >= 2:
             self.labels_ = self._assign_labels(sim_mat)
 
-        return self
+        return sim_mat
 
     def _build_tree(
         self,
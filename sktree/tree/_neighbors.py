@@ -1,7 +1,39 @@
 import numpy as np
+from scipy.sparse import csr_matrix
 
+# Relative cost of accumulating one co-occurring sample pair through a sparse
+# matrix product, compared to one entry of a dense per-tree comparison.
+_SPARSE_PAIR_COST = 16
 
-def compute_forest_similarity_matrix(forest, X):
+
+def _leaf_indicator_matrix(X_leaves, dtype):
+    """Sparse indicator of the leaf each sample falls into, for every tree.
+
+    Parameters
+    ----------
+    X_leaves : ndarray of shape (n_samples, n_estimators)
+        The leaf index of each sample in each tree.
+    dtype : dtype
+        The dtype of the indicator matrix.
+
+    Returns
+    -------
+    indicator : csr_matrix of shape (n_samples, n_leaf_indices)
+        One column per (tree, leaf index) pair, such that ``indicator @ indicator.T``
+        counts the trees in which each pair of samples shares a leaf.
+    """
+    n_samples, n_est = X_leaves.shape
+    n_nodes = X_leaves.max(axis=0) + 1
+    offsets = np.concatenate(([0], np.cumsum(n_nodes)[:-1]))
+
+    # every row holds exactly one entry per tree, in increasing column order
+    indices = (X_leaves + offsets).ravel()
+    indptr = np.arange(0, n_samples * n_est + 1, n_est)
+    data = np.ones(indices.size, dtype=dtype)
+    return csr_matrix((data, indices, indptr), shape=(n_samples, n_nodes.sum()))
+
+
+def compute_forest_similarity_matrix(forest, X, sparse_output=False):
     """Compute the similarity matrix of samples in X using a trained forest.
 
     As an intermediate calculation, the forest applies the dataset and gets
@@ -14,10 +46,14 @@ def compute_forest_similarity_matrix(forest, X):
         The fitted forest.
     X : array-like of shape (n_samples, n_features)
         The input data.
+    sparse_output : bool, default=False
+        Whether to return the similarity matrix as a sparse CSR matrix, which only
+        stores the pairs of samples that share a leaf in at least one tree. This
+        saves memory for deep forests, where most pairs never share a leaf.
 
     Returns
     -------
-    aff_matrix : array-like of shape (n_samples, n_samples)
+    aff_matrix : array-like or sparse matrix of shape (n_samples, n_samples)
         The estimated distance matrix.
     """
     if hasattr(forest, "estimator_"):
@@ -30,7 +66,30 @@ def compute_forest_similarity_matrix(forest, X):
         X_leaves = forest.apply(X)[:, np.newaxis]
         n_est = 1
 
-    aff_matrix = sum(np.equal.outer(X_leaves[:, i], X_leaves[:, i]) for i in range(n_est))
+    # The counts are bounded by the number of trees, so the smallest unsigned integer
+    # type holding it suffices (e.g. one byte per pair for forests of less than 256 trees).
+    n_samples = X_leaves.shape[0]
+    count_dtype = np.min_scalar_type(n_est)
+
+    # number of co-occurring sample pairs, summed over the trees
+    n_pairs = sum(np.square(np.bincount(leaves), dtype=np.int64).sum() for leaves in X_leaves.T)
+    if sparse_output or n_pairs * _SPARSE_PAIR_COST < n_est * n_samples**2:
+        # deep trees with small leaves: only visit the pairs that share a leaf,
+        # with a compiled sparse product of the leaf indicators
+        indicator = _leaf_indicator_matrix(X_leaves, count_dtype)
+        aff_matrix = indicator @ indicator.T
+        if sparse_output:
+            aff_matrix = aff_matrix.astype(np.float64)
+            aff_matrix.data /= n_est
+            return aff_matrix
+        aff_matrix = aff_matrix.toarray()
+    else:
+        # accumulate the co-occurrences of each tree in place, rather than allocating
+        # a new (n_samples, n_samples) array for every tree
+        aff_matrix = np.zeros((n_samples, n_samples), dtype=count_dtype)
+        for leaves in X_leaves.T:
+            aff_matrix += np.equal.outer(leaves, leaves)
+
     # normalize by the number of trees
     aff_matrix = np.divide(aff_matrix, n_est)
     return aff_matrix
@@ -49,7 +108,7 @@ class SimMatrixMixin:
     This augments tree/forest models with the sklearn's nearest-neighbors API.
     """
 
-    def compute_similarity_matrix(self, X):
+    def compute_similarity_matrix(self, X, sparse_output=False):
         """
         Compute the similarity matrix of samples in X.
 
@@ -57,13 +116,15 @@ class SimMatrixMixin:
         ----------
         X : array-like of shape (n_samples, n_features)
             The input data.
+        sparse_output : bool, default=False
+            Whether to return the similarity matrix as a sparse CSR matrix.
 
         Returns
         -------
-        sim_matrix : array-like of shape (n_samples, n_samples)
+        sim_matrix : array-like or sparse matrix of shape (n_samples, n_samples)
             The similarity matrix among the samples.
         """
-        return compute_forest_similarity_matrix(self, X)
+        return compute_forest_similarity_matrix(self, X, sparse_output=sparse_output)
 
     def _more_tags(self):
         # XXX: no scikit-tree estimators support NaNs as of now
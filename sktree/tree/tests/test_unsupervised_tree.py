@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose, assert_array_equal
 from sklearn import datasets
 from sklearn.cluster import AgglomerativeClustering
 from sklearn.datasets import make_blobs
@@ -220,3 +221,44 @@ def test_check_iris(name, Tree, criterion):
     assert score > expected_score, "Iris failed with {0}, criterion = {1} and score = {2}".format(
         name, criterion, score
     )
+
+
+@pytest.mark.parametrize("name,Tree", TREE_CLUSTERS.items())
+def test_fit_transform_matches_fit_then_transform(name, Tree):
+    X, _ = make_blobs(n_samples=100, centers=2, n_features=5, random_state=12345)
+
+    sim_mat = Tree(random_state=12345).fit_transform(X)
+    est = Tree(random_state=12345).fit(X)
+    assert np.array_equal(sim_mat, est.transform(X)), f"{name} fit_transform differs"
+    assert np.array_equal(est.labels_, est._assign_labels(sim_mat))
+
+
+def test_twomeans_tree_matches_reference_fit():
+    """Test that TwoMeans splits are unchanged by its proxy impurity improvement.
+
+    The reference was fit with the generic proxy computed from the children
+    impurities, before ``TwoMeans`` overrode it.
+    """
+    X, _ = make_blobs(n_samples=40, centers=2, n_features=3, random_state=12345)
+    est = UnsupervisedDecisionTree(criterion="twomeans", max_depth=3, random_state=12345).fit(X)
+
+    expected_feature = [1, 0, 0, -2, -2, 1, -2, -2, 1, 1, -2, -2, 1, -2, -2]
+    expected_threshold = [
+        -4.518444538116455,
+        7.987765312194824,
+        6.890943765640259,
+        -2.0,
+        -2.0,
+        -5.132938385009766,
+        -2.0,
+        -2.0,
+        2.6930456161499023,
+        -4.3073506355285645,
+        -2.0,
+        -2.0,
+        3.351668953895569,
+        -2.0,
+        -2.0,
+    ]
+    assert_array_equal(est.tree_.feature, expected_feature)
+    assert_allclose(est.tree_.threshold, expected_threshold)